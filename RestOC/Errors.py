@@ -3,6 +3,7 @@
 REST_REQUEST_DATA		= 100
 REST_CONTENT_TYPE		= 101
 REST_AUTHORIZATION		= 102
+REST_RESPONSE_DATA		= 103
 
 SERVICE_ACTION			= 200
 SERVICE_STATUS			= 201
@@ -11,3 +12,4 @@ SERVICE_UNREACHABLE		= 203
 SERVICE_NOT_REGISTERED	= 204
 SERVICE_NO_SUCH_NOUN	= 205
 SERVICE_INTERNAL_KEY	= 206
+SERVICE_BATCH_OP		= 207
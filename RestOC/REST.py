@@ -10,10 +10,11 @@ __version__ = "1.0.0"
 __created__ = "2018-11-11"
 
 # Python imports
-import json, re
+import re
 
 # Pip imports
 import bottle
+import orjson
 
 # Framework imports
 from . import Errors, Services, Sesh
@@ -93,9 +94,9 @@ class _Route(object):
 
 			# Convert the GET and store the data
 			try:
-				mData = json.loads(bottle.request.query['d'])
+				mData = orjson.loads(bottle.request.query['d'])
 			except Exception as e:
-				return str(Services.Effect(error=(Errors.REST_REQUEST_DATA, '%s\n%s' % (bottle.request.query['d'], str(e)))))
+				return bytes(Services.Effect(error=(Errors.REST_REQUEST_DATA, '%s\n%s' % (bottle.request.query['d'], str(e)))))
 
 		# Else we most likely got the data in the body
 		else:
@@ -103,9 +104,9 @@ class _Route(object):
 			# Make sure the request send JSON
 			try:
 				if bottle.request.headers['Content-Type'].lower() not in ('application/json; charset=utf8', 'application/json; charset=utf-8'):
-					return str(Services.Effect(error=Errors.REST_CONTENT_TYPE))
+					return bytes(Services.Effect(error=Errors.REST_CONTENT_TYPE))
 			except KeyError:
-				return str(Services.Effect(error=Errors.REST_CONTENT_TYPE))
+				return bytes(Services.Effect(error=Errors.REST_CONTENT_TYPE))
 
 			# Store the body, if it's too big we need to read it rather than
 			#	use getvalue
@@ -114,9 +115,9 @@ class _Route(object):
 
 			# Convert the body and store it
 			try:
-				if sBody: mData = json.loads(sBody)
+				if sBody: mData = orjson.loads(sBody)
 			except Exception as e:
-				return str(Services.Effect(error=(Errors.REST_REQUEST_DATA,'%s\n%s' % (sBody, str(e)))))
+				return bytes(Services.Effect(error=(Errors.REST_REQUEST_DATA,'%s\n%s' % (sBody, str(e)))))
 
 		# If the request should have sent a session
 		if self.sesh:
@@ -124,7 +125,7 @@ class _Route(object):
 			# Is there an Authorization token
 			if 'Authorization' not in bottle.request.headers:
 				bottle.response.status = 401
-				return str(Services.Effect(error=Errors.REST_AUTHORIZATION))
+				return bytes(Services.Effect(error=Errors.REST_AUTHORIZATION))
 
 			# Get the session from the Authorization token
 			oSession = Sesh.load(bottle.request.headers['Authorization'])
@@ -132,7 +133,7 @@ class _Route(object):
 			# If the session is not found
 			if not oSession:
 				bottle.response.status = 401
-				return str(Services.Effect(error=Errors.REST_AUTHORIZATION))
+				return bytes(Services.Effect(error=Errors.REST_AUTHORIZATION))
 
 			# Else, extend the session
 			else:
@@ -151,8 +152,17 @@ class _Route(object):
 		elif bottle.request.method == 'PUT':
 			oEffect = Services.update(self.service, self.path, mData, oSession)
 
-		# Return the effect as a string
-		return str(oEffect)
+		# If the handler returned something other than an Effect, return it
+		#	as a string like it always has been
+		if not isinstance(oEffect, Services.Effect):
+			return str(oEffect)
+
+		# Return the effect as encoded JSON, if it can't be encoded, for
+		#	example because of an integer wider than 64 bits, return an error
+		try:
+			return bytes(oEffect)
+		except TypeError as e:
+			return bytes(Services.Effect(error=(Errors.REST_RESPONSE_DATA, str(e))))
 
 class Config(object):
 	"""Config class
@@ -10,34 +10,310 @@ __version__ = "1.0.0"
 __created__ = "2018-11-11"
 
 # Python imports
-from hashlib import sha1
-import json
+import asyncio
+import atexit
+from functools import lru_cache
+from hashlib import blake2s, sha1
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+import hmac
+import logging
+import re
+import sys
 from time import time
-from datetime import datetime
 
 # Pip imports
+import aiohttp
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 # Framework imports
 from . import Errors, Sesh
 
+# Use the compiled path conversion if it was built
+try: from .Services_fast import pathToMethod as _fastPathToMethod
+except ImportError: _fastPathToMethod = None
+
+_SEPARATOR = re.compile(r'[/_](.?)')
+"""Matches a path separator and the character following it"""
+
+_MISSING = object()
+"""Default for reading Effect values that were never set, never stored"""
+
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+"""Options used when encoding JSON"""
+
 __mbVerbose = False
-"""Verbose Flag"""
+"""Verbose Flag, only changed by verbose()"""
+
+__moLog = logging.getLogger('RestOC.Services')
+"""Logger used to track requests in verbose mode"""
+
+# Only log requests once verbose() is called, not because the root logger
+#	is at DEBUG, as the data sent may be sensitive
+__moLog.setLevel(logging.WARNING)
 
 __mdRegistered = {}
 """Registered Services"""
 
+__mSession = requests.Session()
+"""Shared HTTP session so connections to services are kept alive"""
+
+# Pool connections per host and mount the adapter for both protocols
+__mAdapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+__mSession.mount('http://', __mAdapter)
+__mSession.mount('https://', __mAdapter)
+
+# The session is shared by every user, so never store cookies from services
+__mSession.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+# Close any pooled connections when the interpreter exits
+atexit.register(__mSession.close)
+
+__mdHeaders = {
+	'Content-Type': 'application/json; charset=utf-8'
+}
+"""Headers sent with every request to a remote service"""
+
 __funcToRequest = {
-	'create': [requests.post, 'POST'],
-	'delete': [requests.delete, 'DELETE'],
-	'read': [requests.get, 'GET'],
-	'update': [requests.put, 'PUT']
+	'create': ('POST', __mSession.post),
+	'delete': ('DELETE', __mSession.delete),
+	'read': ('GET', __mSession.get),
+	'update': ('PUT', __mSession.put)
 }
 """Map functions to REST types"""
 
+__mAioSession = None
+"""Shared asynchronous HTTP session, created on first use"""
+
+__mAioLoop = None
+"""The event loop the asynchronous session was created on"""
+
+__mAioKeeper = None
+"""Async generator holding the asynchronous session, see __aioKeeper()"""
+
 __msSalt = None
 """Internal Key Salt"""
 
+__mbSalt = None
+"""Internal Key Salt encoded as bytes"""
+
+__mbKey = None
+"""Internal Key Salt sized for use as a BLAKE2s key"""
+
+__msKeys = 'v1'
+"""Which internal keys are generated and accepted, see register()"""
+
+async def __aioKeeper(session):
+	"""AIO Keeper
+
+	Async generator that holds the session until it is closed. Event loops
+	close any unfinished async generators when they shut down, as
+	asyncio.run() does, so the session is closed on its own loop before that
+	loop goes away
+
+	Arguments:
+		session (aiohttp.ClientSession): The session to close
+
+	Returns:
+		async_generator
+	"""
+	try: yield
+	finally: await session.close()
+
+async def __aioSession():
+	"""AIO Session
+
+	Returns the shared aiohttp session, creating it if it doesn't exist yet,
+	has been closed, or belongs to a different event loop. Must be called from
+	within a running event loop
+
+	Returns:
+		aiohttp.ClientSession
+	"""
+
+	# Pull in the global session, the loop it was created on, and its keeper
+	global __mAioSession, __mAioLoop, __mAioKeeper
+
+	# Get the current loop
+	oLoop = asyncio.get_running_loop()
+
+	# If we don't have an open session for this loop, create one. Like the
+	#	shared requests session it never stores cookies, as it's used for
+	#	every user, and requests never time out
+	if __mAioSession is None or __mAioSession.closed or __mAioLoop is not oLoop:
+		__mAioSession = aiohttp.ClientSession(
+			connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=30),
+			cookie_jar=aiohttp.DummyCookieJar(),
+			timeout=aiohttp.ClientTimeout(total=None)
+		)
+		__mAioLoop = oLoop
+
+		# Start a keeper so the session is closed when the loop shuts down, a
+		#	previous keeper is closed on its own loop once it's dropped
+		__mAioKeeper = __aioKeeper(__mAioSession)
+		await __mAioKeeper.__anext__()
+
+	# Return the session
+	return __mAioSession
+
+def __buildRequest(service, action, path, data, sesh):
+	"""Build Request
+
+	Generates everything needed to make an HTTP request to a remote service
+
+	Arguments:
+		service (dict): The registered service
+		action (str): The action to take on the service
+		path (str): The path of the request
+		data (mixed): The data being sent with the request
+		sesh (Sesh._Session): The optional session to pass with the request
+
+	Raises:
+		EffectException
+
+	Returns:
+		tuple: The HTTP method, the session function, the URL, the body, and
+			the headers
+	"""
+
+	# Find the HTTP method and function for the action
+	tRequest = __funcToRequest.get(action)
+	if tRequest is None:
+		raise EffectException(error=(Errors.SERVICE_ACTION, action))
+	sMethod, fRequest = tRequest
+
+	# Generate the URL to reach the service
+	sURL = service['url'] + path
+
+	# Log the call
+	__moLog.debug('Calling %s %s %s', sMethod, sURL, data)
+
+	# Copy the headers, the HTTP library sets the length from the data
+	dHeaders = __mdHeaders.copy()
+
+	# If we have a session, add the ID to the headers
+	if sesh:
+		dHeaders['Authorization'] = sesh.id()
+
+	# Return the parts, converting the data to JSON
+	return sMethod, fRequest, sURL, orjson.dumps(data, option=_JSON_OPTIONS), dHeaders
+
+def __callLocal(instance, service, action, path, data, sesh):
+	"""Call Local
+
+	Calls the action directly on a locally loaded service
+
+	Arguments:
+		instance (Service): The instance of the service
+		service (str): The name of the service
+		action (str): The action to take on the service
+		path (str): The path of the request
+		data (mixed): The data being sent with the request
+		sesh (Sesh._Session): The optional session to pass with the request
+
+	Raises:
+		TypeError
+
+	Returns:
+		Effect
+	"""
+
+	# Log the call
+	__moLog.debug('Calling %s.%s("%s", %s)', service, action, path, data)
+
+	# Directly call the action
+	oEffect = getattr(instance, action)(path, data, sesh)
+
+	# If verbose() was turned on, make sure the service handed back the Effect
+	#	itself rather than something that needs to be converted
+	if __mbVerbose and not isinstance(oEffect, Effect):
+		raise TypeError('%s.%s("%s") returned %s, not an Effect' % (service, action, path, type(oEffect).__name__))
+
+	# Return the effect
+	return oEffect
+
+def __closeClient(service):
+	"""Close Client
+
+	Closes the HTTP/2 client of a registered service, if it has one
+
+	Arguments:
+		service (str): The name of the service
+
+	Returns:
+		None
+	"""
+	dService = __mdRegistered.get(service)
+	if dService is not None and 'client' in dService:
+		dService['client'].close()
+
+def __closeClients():
+	"""Close Clients
+
+	Closes the HTTP/2 clients of all registered services
+
+	Returns:
+		None
+	"""
+	for k in list(__mdRegistered):
+		__closeClient(k)
+
+# Close the HTTP/2 clients when the interpreter exits
+atexit.register(__closeClients)
+
+def __findService(service):
+	"""Find Service
+
+	Returns the registration details of a service
+
+	Arguments:
+		service (str): The name of the service
+
+	Raises:
+		EffectException
+
+	Returns:
+		dict
+	"""
+
+	# Find the registered service
+	dService = __mdRegistered.get(service)
+	if dService is None:
+		raise EffectException(error=(Errors.SERVICE_NOT_REGISTERED, service))
+
+	# Return it
+	return dService
+
+def __parseResponse(status, headers, content):
+	"""Parse Response
+
+	Checks the response from a remote service and converts it into an Effect
+
+	Arguments:
+		status (int): The HTTP status code
+		headers (mapping): The response headers
+		content (bytes): The body of the response
+
+	Returns:
+		Effect
+	"""
+
+	# If the request wasn't successful
+	if status != 200:
+		return Effect(error=(Errors.SERVICE_STATUS, '%d: %s' % (status, content)))
+
+	# If we didn't get JSON back
+	sContentType = headers.get('Content-Type', '')
+	if not sContentType.lower().startswith('application/json'):
+		return Effect(error=(Errors.SERVICE_CONTENT_TYPE, sContentType))
+
+	# Turn the content into an Effect and return it
+	oEffect = Effect.fromJSON(content)
+	__moLog.debug('Returning %s', oEffect)
+	return oEffect
+
 def __request(service, action, path, data, sesh=None):
 	"""Request
 
@@ -57,74 +333,107 @@ def __request(service, action, path, data, sesh=None):
 		Effect
 	"""
 
-	# If we have a registered service
-	if service in __mdRegistered:
+	# Find the registered service
+	dService = __findService(service)
 
-		# If the service is locally loaded
-		if 'instance' in __mdRegistered[service]:
+	# If the service is locally loaded, call it directly
+	oInstance = dService.get('instance')
+	if oInstance is not None:
+		oEffect = __callLocal(oInstance, service, action, path, data, sesh)
+		__moLog.debug('Returning %s', oEffect)
+		return oEffect
 
-			# If verbose requested
-			if __mbVerbose: print('%s: Calling %s.%s("%s", %s)' % (str(datetime.now()), service, action, path, str(data)))
+	# Generate the request
+	try: sMethod, fRequest, sURL, sData, dHeaders = __buildRequest(dService, action, path, data, sesh)
+	except EffectException as e: return e.args[0]
 
-			# Directly call the action
-			oEffect = getattr(__mdRegistered[service]['instance'], action)(
-				path, data, sesh
-			)
+	# Try to make the request and store the response
+	try:
 
-		# Else if the service is running elsewhere
+		# If the service has its own HTTP/2 client, use it
+		oClient = dService.get('client')
+		if oClient is not None:
+			oRes = oClient.request(sMethod, sURL, content=sData, headers=dHeaders)
+
+		# Else use the shared session
 		else:
+			oRes = fRequest(sURL, data=sData, headers=dHeaders)
 
-			try: __funcToRequest[action]
-			except KeyError: Effect(error=(Errors.SERVICE_ACTION, action))
+	# If we couldn't connect to the service
+	except (requests.ConnectionError, httpx.TransportError) as e:
+		return Effect(error=(Errors.SERVICE_UNREACHABLE, str(e)))
 
-			# Generate the URL to reach the service
-			sURL = __mdRegistered[service]['url'] + path
+	# Check the response and turn it into an Effect
+	return __parseResponse(oRes.status_code, oRes.headers, oRes.content)
 
-			# If verbose requested
-			if __mbVerbose:
-				print('%s: Calling %s %s %s)' % (str(datetime.now()), __funcToRequest[action][1], sURL, str(data)))
+async def __requestAsync(service, action, path, data, sesh=None):
+	"""Request Async
 
-			# Convert the data to JSON
-			sData = json.dumps(data)
+	Asynchronous version of __request so that calls to several services can be
+	made concurrently
 
-			# Create the headers
-			dHeaders = {
-				'Content-Type': 'application/json; charset=utf-8',
-				'Content-Length': str(len(sData))
-			}
+	Arguments:
+		service (str): The service we are requesting data from
+		action (str): The action to take on the service
+		path (str): The path of the request
+		data (mixed): The data being sent with the request
+		sesh (Sesh._Session): The optional session to pass with the request
 
-			# If we have a session, add the ID to the headers
-			if sesh:
-				dHeaders['Authorization'] = sesh.id()
+	Raises:
+		ServiceException
 
-			# Try to make the request and store the response
-			try:
-				oRes = __funcToRequest[action][0](sURL, data=sData, headers=dHeaders)
+	Return:
+		Effect
+	"""
 
-				# If the request wasn't successful
-				if oRes.status_code != 200:
-					return Effect(error=(Errors.SERVICE_STATUS, '%d: %s' % (oRes.status_code, oRes.content)))
+	# Find the registered service
+	dService = __findService(service)
 
-				# If we got the wrong content type
-				if oRes.headers['Content-Type'].lower() != 'application/json; charset=utf-8':
-					return Effect(error=(Errors.SERVICE_CONTENT_TYPE, '%s' % oRes.headers['content-type']))
+	# If the service is locally loaded, call it directly
+	oInstance = dService.get('instance')
+	if oInstance is not None:
+		oEffect = __callLocal(oInstance, service, action, path, data, sesh)
+		__moLog.debug('Returning %s', oEffect)
+		return oEffect
 
-			# If we couldn't connect to the service
-			except requests.ConnectionError as e:
-				return Effect(error=(Errors.SERVICE_UNREACHABLE, str(e)))
+	# Generate the request
+	try: sMethod, _, sURL, sData, dHeaders = __buildRequest(dService, action, path, data, sesh)
+	except EffectException as e: return e.args[0]
 
-			# Else turn the content into an Effect and return it
-			oEffect = Effect.fromJSON(oRes.text)
+	# Try to make the request and store the response
+	try:
+		async with (await __aioSession()).request(sMethod, sURL, data=sData, headers=dHeaders) as oRes:
+			bContent = await oRes.read()
 
-		# If verbose requested
-		if __mbVerbose:	print('%s: Returning %s\n' % (str(datetime.now()), str(oEffect)))
+	# If we couldn't connect to the service
+	except aiohttp.ClientConnectionError as e:
+		return Effect(error=(Errors.SERVICE_UNREACHABLE, str(e)))
 
-		# Return the effect of the request
-		return oEffect
+	# Check the response and turn it into an Effect
+	return __parseResponse(oRes.status, oRes.headers, bContent)
 
-	# Service not registered
-	else:
-		raise EffectException(error=(Errors.SERVICE_NOT_REGISTERED, service))
+async def closeAsync():
+	"""Close Async
+
+	Closes the shared asynchronous HTTP session, if one was created. Should be
+	awaited before the event loop used for the async requests is closed
+
+	Returns:
+		None
+	"""
+
+	# Pull in the global session, the loop it was created on, and its keeper
+	global __mAioSession, __mAioLoop, __mAioKeeper
+
+	# If there's a session on this loop, close its keeper, which closes the
+	#	session. One from another loop is closed when that loop shuts down
+	if __mAioKeeper is not None and __mAioLoop is asyncio.get_running_loop():
+		await __mAioKeeper.aclose()
+
+	# Forget the session
+	__mAioSession = None
+	__mAioLoop = None
+	__mAioKeeper = None
 
 def create(service, path, data, sesh=None):
 	"""Create
@@ -142,6 +451,22 @@ def create(service, path, data, sesh=None):
 	"""
 	return __request(service, 'create', path, data, sesh)
 
+async def createAsync(service, path, data, sesh=None):
+	"""Create Async
+
+	Make a POST request without blocking the event loop
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		data (mixed): The data to pass to the request
+		sesh {Sesh._Session}: The optional session to send with the request
+
+	Returns:
+		Effect
+	"""
+	return await __requestAsync(service, 'create', path, data, sesh)
+
 def delete(service, path, data, sesh=None):
 	"""Delete
 
@@ -158,11 +483,29 @@ def delete(service, path, data, sesh=None):
 	"""
 	return __request(service, 'delete', path, data, sesh)
 
+async def deleteAsync(service, path, data, sesh=None):
+	"""Delete Async
+
+	Make a DELETE request without blocking the event loop
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		data (mixed): The data to pass to the request
+		sesh {Sesh._Session}: The optional session to send with the request
+
+	Returns:
+		Effect
+	"""
+	return await __requestAsync(service, 'delete', path, data, sesh)
+
 def internalKey(key = None):
 	"""Internal Key
 
 	Generates or validates an internal key so services can communicate with
-	each other
+	each other. Depending on the keys mode set in register(), keys are either
+	legacy "sha1:time" keys, or "v2:digest:time" keys using a BLAKE2s MAC
+	keyed by the salt
 
 	Arguments:
 		key (str): Passed to validate a key
@@ -171,8 +514,8 @@ def internalKey(key = None):
 		bool
 	"""
 
-	# Pull in salt
-	global __msSalt
+	# Pull in salts and the keys mode
+	global __mbSalt, __mbKey, __msKeys
 
 	# Generate a timestamp
 	iTime = int(time())
@@ -180,30 +523,58 @@ def internalKey(key = None):
 	# If no key was passed
 	if key is None:
 
-		# Generate a timestamp and store it as a string
-		sTime = str(iTime)
+		# Store the timestamp as bytes
+		bTime = b'%010d' % iTime
 
-		# Generate a sha1 from the salt and parts of the time
-		sSHA1 = sha1(sTime[5:].encode('utf-8') + __msSalt.encode('utf-8') + sTime[:5].encode('utf-8')).hexdigest()
+		# If we're still generating legacy keys, use a sha1 from the salt and
+		#	parts of the time
+		if __msKeys == 'v1':
+			return '%s:%d' % (sha1(bTime[5:] + __mbSalt + bTime[:5]).hexdigest(), iTime)
 
-		# Generate a key using the sha1 and the time
-		return sSHA1 + ':' + sTime
+		# Generate a digest of the time keyed by the salt
+		sDigest = blake2s(bTime, key=__mbKey, digest_size=16).hexdigest()
+
+		# Generate a key using the version, the digest, and the time
+		return 'v2:%s:%d' % (sDigest, iTime)
 
 	# If the key was passed
 	else:
 		try:
-			# Split the key into sha1 and timestamp
-			sSHA1_, sTime = key.split(':')
+			# Split the key into its parts
+			lParts = key.split(':')
+
+			# If it's a versioned key
+			if len(lParts) == 3 and lParts[0] == 'v2':
+				sDigest_, sTime = lParts[1:]
+				bLegacy = False
+
+			# Else it's a legacy sha1 and timestamp, if they're still allowed
+			elif __msKeys != 'v2':
+				sDigest_, sTime = lParts
+				bLegacy = True
+
+			# Else the key is invalid
+			else:
+				return False
 
 			# If the time is not close enough
-			if iTime - int(sTime) > 5:
+			iKeyTime = int(sTime)
+			if iTime - iKeyTime > 5:
 				return False
 
+			# Store the key's timestamp as bytes
+			bTime = b'%010d' % iKeyTime
+
 			# Generate a sha1 from the salt and parts of the time
-			sSHA1 = sha1(sTime[5:].encode('utf-8') + __msSalt.encode('utf-8') + sTime[:5].encode('utf-8')).hexdigest()
+			if bLegacy:
+				sDigest = sha1(bTime[5:] + __mbSalt + bTime[:5]).hexdigest()
 
-			# If the sha1s match return true
-			return sSHA1 == sSHA1_
+			# Else generate a digest of the time keyed by the salt
+			else:
+				sDigest = blake2s(bTime, key=__mbKey, digest_size=16).hexdigest()
+
+			# If the digests match return true
+			return hmac.compare_digest(sDigest, sDigest_)
 
 		# If something went wrong, return false
 		except Exception:
@@ -225,16 +596,83 @@ def read(service, path, data, sesh=None):
 	"""
 	return __request(service, 'read', path, data, sesh)
 
-def register(services, restconf, salt):
+async def readAsync(service, path, data, sesh=None):
+	"""Read Async
+
+	Make a GET request without blocking the event loop
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		data (mixed): The data to pass to the request
+		sesh {Sesh._Session}: The optional session to send with the request
+
+	Returns:
+		Effect
+	"""
+	return await __requestAsync(service, 'read', path, data, sesh)
+
+def readMany(service, ops, sesh=None):
+	"""Read Many
+
+	Makes several reads on the same service in one request. Remote services
+	receive all the reads in a single POST to their "_batch" path, so the
+	service's REST server must have a route to it. Only paths the service
+	lists in its _batchPaths can be read, see Service.readBatch
+
+	Arguments:
+		service (str): The service to call
+		ops (list): A list of (path, data) pairs to read
+		sesh {Sesh._Session}: The optional session to send with the request
+
+	Returns:
+		Effect[]
+	"""
+
+	# Find the registered service
+	dService = __findService(service)
+
+	# If the service is locally loaded, call it directly
+	oInstance = dService.get('instance')
+	if oInstance is not None:
+		return oInstance.readBatch(ops, sesh)
+
+	# Send all the reads at once
+	oEffect = __request(service, 'create', '_batch', {"ops": ops}, sesh)
+
+	# If the batch itself failed, every read failed, give each its own copy
+	#	so changing one doesn't change the others
+	if oEffect.errorExists():
+		return [Effect(error=dict(oEffect.error)) for _ in ops]
+
+	# If the service didn't send back one result for each read, we can't
+	#	tell which result belongs to which read, so fail them all
+	if not isinstance(oEffect.data, list) or \
+		len(oEffect.data) != len(ops) or \
+		not all(isinstance(d, dict) for d in oEffect.data):
+		return [Effect(error=(Errors.SERVICE_BATCH_OP, 'invalid batch response')) for _ in ops]
+
+	# Convert each result back into an Effect, in the same order as the ops
+	return [Effect.fromDict(d) for d in oEffect.data]
+
+def register(services, restconf, salt, keys='v1'):
 	"""Register
 
 	Takes a dictionary of services to their instances, or None for remote
-	services which will be found via the config
+	services which will be found via the config. Remote services with
+	"http2" set in their config are called over HTTP/2, if their url is plain
+	http the service must accept HTTP/2 without an upgrade (h2c with prior
+	knowledge)
 
 	Arguments:
 		services (dict): Services being registered
 		restconf (dict): Configuration variables for remote services
 		salt (str): The salt used for internal key generation
+		keys (str): The internal keys to use. "v1" generates legacy sha1 keys
+			and accepts both kinds, "both" generates v2 keys and accepts both
+			kinds, and "v2" generates and accepts only v2 keys. To move
+			services to v2 without breaking calls between them, deploy "v1"
+			everywhere, then "both" everywhere, then "v2"
 
 	Raises:
 		ValueError
@@ -243,9 +681,19 @@ def register(services, restconf, salt):
 		None
 	"""
 
-	# Pull in the global salt variable and set it
-	global __msSalt
+	# Make sure the keys mode is valid and set it
+	global __msKeys
+	if keys not in ('v1', 'both', 'v2'):
+		raise ValueError('keys')
+	__msKeys = keys
+
+	# Pull in the global salt variables and set them
+	global __msSalt, __mbSalt, __mbKey
 	__msSalt = salt
+	__mbSalt = salt.encode('utf-8')
+
+	# BLAKE2s keys are limited to 32 bytes, so hash any longer salt down
+	__mbKey = len(__mbSalt) <= 32 and __mbSalt or blake2s(__mbSalt).digest()
 
 	# If we didn't get a dictionary
 	if not isinstance(services, dict):
@@ -254,17 +702,15 @@ def register(services, restconf, salt):
 	# Loop through the list of services to register
 	for k,v in services.items():
 
-		# If verbose requested
-		if __mbVerbose: print('Registering service "%s": ' % str(k), end='')
-
 		# If we received a local instance
 		if isinstance(v, Service):
 
-			# Store it
+			# Close any previous client and store it
+			__closeClient(k)
 			__mdRegistered[k] = {"instance":v}
 
-			# If verbose requested
-			if __mbVerbose:	print('instance')
+			# Log the registration
+			__moLog.debug('Registering service "%s": instance', k)
 
 			# Call the services initialise method
 			v.initialise()
@@ -276,11 +722,30 @@ def register(services, restconf, salt):
 			if k not in restconf:
 				raise ValueError('services.%s' % k)
 
-			# Store it
+			# Close any previous client and store it
+			__closeClient(k)
 			__mdRegistered[k] = {"url":restconf[k]['url']}
 
-			# If verbose mode is on
-			if __mbVerbose:	print('%s' % __mdRegistered[k]['url'])
+			# If the service should be reached over HTTP/2, give it its own
+			#	client so requests can be multiplexed on one connection. Over
+			#	https HTTP/2 is negotiated, over plain http there's no
+			#	negotiation, so HTTP/1.1 is turned off to force HTTP/2. Like the
+			#	shared session, cookies are never stored and requests never
+			#	time out
+			if restconf[k].get('http2'):
+				oClient = httpx.Client(
+					http1=not restconf[k]['url'].startswith('http://'),
+					http2=True,
+					cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+					timeout=None,
+					limits=httpx.Limits(
+						max_connections=100, max_keepalive_connections=20
+					)
+				)
+				__mdRegistered[k]['client'] = oClient
+
+			# Log the registration
+			__moLog.debug('Registering service "%s": %s', k, __mdRegistered[k]['url'])
 
 		# Else, the value is invalid
 		else:
@@ -302,10 +767,28 @@ def update(service, path, data, sesh=None):
 	"""
 	return __request(service, 'update', path, data, sesh)
 
+async def updateAsync(service, path, data, sesh=None):
+	"""Update Async
+
+	Make a PUT request without blocking the event loop
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		data (mixed): The data to pass to the request
+		sesh {Sesh._Session}: The optional session to send with the request
+
+	Returns:
+		Effect
+	"""
+	return await __requestAsync(service, 'update', path, data, sesh)
+
 def verbose(flag=True):
 	"""Verbose
 
-	Puts Services in verbose mode for easy tracking of requests
+	Puts Services in verbose mode for easy tracking of requests. Requests are
+	logged at DEBUG level to the "RestOC.Services" logger, if no handler has
+	been configured one is added that writes to stdout
 
 	Arguments:
 		flag (bool): defaults to True
@@ -314,15 +797,26 @@ def verbose(flag=True):
 		None
 	"""
 
+	# Store the flag
 	global __mbVerbose
+	__mbVerbose = flag
 
-	if __mbVerbose and not flag:
-		print('Service verbose mode will be turned off')
+	# If verbose is being turned off
+	if not flag:
+		__moLog.debug('Service verbose mode will be turned off')
+		__moLog.setLevel(logging.WARNING)
 
-	__mbVerbose = flag
+	# Else it's being turned on
+	else:
+
+		# If nothing will output the messages, add a handler
+		if not __moLog.hasHandlers():
+			oHandler = logging.StreamHandler(sys.stdout)
+			oHandler.setFormatter(logging.Formatter('%(created)f: %(message)s'))
+			__moLog.addHandler(oHandler)
 
-	if __mbVerbose:
-		print('Service verbose mode has been turned on')
+		__moLog.setLevel(logging.DEBUG)
+		__moLog.debug('Service verbose mode has been turned on')
 
 class Effect(object):
 	"""Effect
@@ -330,6 +824,8 @@ class Effect(object):
 	Represents a standard result from any/all requests
 	"""
 
+	__slots__ = ('data', 'error', 'warning')
+
 	def __init__(self, data = None, error = None, warning = None):
 		"""Constructor
 
@@ -381,7 +877,7 @@ class Effect(object):
 				# Else, try to pull out the code and message
 				else:
 					self.error = {"code": error.args[0], "msg": ''}
-					if len(error.args) > 1: dErr['msg'] = error.args[1]
+					if len(error.args) > 1: self.error['msg'] = error.args[1]
 
 			# Else, we got something invalid
 			else:
@@ -391,6 +887,21 @@ class Effect(object):
 		if not warning is None:
 			self.warning = warning
 
+	def __bytes__(self):
+		"""bytes
+
+		Python magic method to return the instance as UTF-8 encoded JSON. Data
+		can include numpy arrays, which are encoded without converting them to
+		lists first. Integers wider than 64 bits can't be encoded
+
+		Raises:
+			TypeError
+
+		Returns:
+			bytes
+		"""
+		return orjson.dumps(self.toDict(), option=_JSON_OPTIONS)
+
 	def __str__(self):
 		"""str
 
@@ -399,24 +910,7 @@ class Effect(object):
 		Returns:
 			str
 		"""
-
-		# Create a temp dict
-		dRet = {}
-
-		# If there's data
-		try: dRet['data'] = self.data
-		except AttributeError: pass
-
-		# If there's an error
-		try: dRet['error'] = self.error
-		except AttributeError: pass
-
-		# If there's a warning
-		try: dRet['warning'] = self.warning
-		except AttributeError: pass
-
-		# Convert the dict and return it
-		return json.dumps(dRet)
+		return self.__bytes__().decode('utf-8')
 
 	def dataExists(self):
 		"""Data Exists
@@ -426,8 +920,7 @@ class Effect(object):
 		Returns:
 			bool
 		"""
-		try: return self.data != None
-		except AttributeError: return False
+		return getattr(self, 'data', None) is not None
 
 	def errorExists(self):
 		"""Error Exists
@@ -437,8 +930,7 @@ class Effect(object):
 		Returns:
 			bool
 		"""
-		try: return self.error != None
-		except AttributeError: return False
+		return getattr(self, 'error', None) is not None
 
 	@classmethod
 	def fromDict(cls, val):
@@ -456,17 +948,10 @@ class Effect(object):
 		# Create a new instance
 		o = cls()
 
-		# If there's data
-		try: o.data = val['data']
-		except KeyError: pass
-
-		# If there's an error
-		try: o.error = val['error']
-		except KeyError: pass
-
-		# If there's a warning
-		try: o.warning = val['warning']
-		except KeyError: pass
+		# Store any values found, leaving the rest unset
+		if 'data' in val: o.data = val['data']
+		if 'error' in val: o.error = val['error']
+		if 'warning' in val: o.warning = val['warning']
 
 		# Return the instance
 		return o
@@ -475,23 +960,52 @@ class Effect(object):
 	def fromJSON(cls, val):
 		"""From JSON
 
-		Tries to convert a string made from str() back into an Effect
+		Tries to convert a string made from str() or bytes() back into an
+		Effect. Passing bytes, such as the raw content of a response, avoids
+		decoding the JSON to a string first
 
 		Arguments:
-			val (str): A valid JSON string
+			val (str|bytes): A valid JSON string
 
 		Returns:
 			Effect
 		"""
 
 		# Try to convert the string to a dict
-		try: d = json.loads(val)
+		try: d = orjson.loads(val)
 		except ValueError as e: raise ValueError('val', str(e))
 		except TypeError as e: raise ValueError('val', str(e))
 
 		# Return the fromDict result
 		return cls.fromDict(d)
 
+	def toDict(self):
+		"""To Dict
+
+		Converts the Effect into a dict, leaving out any missing values
+
+		Returns:
+			dict
+		"""
+
+		# Create a temp dict
+		dRet = {}
+
+		# If there's data
+		m = getattr(self, 'data', _MISSING)
+		if m is not _MISSING: dRet['data'] = m
+
+		# If there's an error
+		m = getattr(self, 'error', _MISSING)
+		if m is not _MISSING: dRet['error'] = m
+
+		# If there's a warning
+		m = getattr(self, 'warning', _MISSING)
+		if m is not _MISSING: dRet['warning'] = m
+
+		# Return the dict
+		return dRet
+
 	def warningExists(self):
 		"""Warning Exists
 
@@ -500,8 +1014,7 @@ class Effect(object):
 	Returns:
 			bool
 		"""
-		try: return self.warning != None
-		except AttributeError: return False
+		return getattr(self, 'warning', None) is not None
 
 class EffectException(Exception):
 	"""Effect Exception
@@ -533,83 +1046,122 @@ class Service(object):
 	The object to build all Services from
 	"""
 
-	def create(self, path, data, sesh=None):
-		"""Create
+	__mdMethods = None
+	"""Cache of paths and actions to the instance methods that handle them"""
 
-		Create a new object
+	__miMethodsMax = 1024
+	"""Maximum number of methods to cache per instance"""
+
+	_batchPaths = {}
+	"""Paths that can be read in a batch, mapped to whether they require a
+	session, e.g. {"user": True}. Empty means batching is disabled"""
+
+	def __dispatch(self, path, data, sesh, action, method):
+		"""Dispatch
+
+		Finds the instance method for the path and action, caching it so
+		further requests skip the lookup, then calls it
 
 		Arguments:
 			path (str): The path passed to the request
 			data (mixed): The data sent with the request
 			sesh (Sesh._Session): The session passed to the request
+			action (str): The suffix for the method, e.g. "_read"
+			method (str): The HTTP method, used in the error for a bad path
 
 		Return:
 			Effect
 		"""
 
-		# Generate the method name from the URI
-		sMethod = self.pathToMethod(path, '_create')
+		# If this instance doesn't have a cache yet, create one
+		dMethods = self.__mdMethods
+		if dMethods is None:
+			dMethods = self.__mdMethods = {}
 
-		# Try to find the method
-		try:
-			f = getattr(self, sMethod)
+		# Look for the method in the cache
+		tKey = (path, action)
+		f = dMethods.get(tKey)
 
-		# Method doesn't exist, URI is invalid
-		except AttributeError as e:
+		# If it's not cached, find it, and store it if it exists and there's
+		#	room, paths come from callers so misses are never cached
+		if f is None:
 
-			# If the method wasn't found
-			if "'%s'" % sMethod in e.args[0]:
-				return Effect(error=(Errors.SERVICE_NO_SUCH_NOUN, 'POST %s' % path))
-			else:
-				raise
+			# Check the class for the name rather than defaulting getattr, so
+			#	an AttributeError raised inside a property isn't hidden
+			sMethod = self.pathToMethod(path, action)
+			if hasattr(type(self), sMethod):
+				f = getattr(self, sMethod)
+			if f is not None and len(dMethods) < self.__miMethodsMax:
+				dMethods[tKey] = f
+
+		# Method doesn't exist, URI is invalid
+		if f is None:
+			return Effect(error=(Errors.SERVICE_NO_SUCH_NOUN, '%s %s' % (method, path)))
 
 		# Try to call the method
 		try:
 			if sesh: return f(data, sesh)
 			else: return f(data)
 
-			# Effect thrown
+		# Effect thrown
 		except EffectException as e:
 			return e.args[0]
 
-	def delete(self, path, data, sesh=None):
-		"""Delete
+	def Batch_create(self, data, sesh=None):
+		"""Batch Create
 
-		Delete an existing object
+		Handles POSTs to the "_batch" path sent by readMany, running each read
+		in order and returning the results together. Services that don't set
+		_batchPaths act as if the path doesn't exist
 
 		Arguments:
-			path (str): The path passed to the request
-			data (mixed): The data sent with the request
+			data (dict): The "ops" to run, a list of [path, data] pairs
 			sesh (Sesh._Session): The session passed to the request
 
 		Return:
 			Effect
 		"""
 
-		# Generate the method name from the URI
-		sMethod = self.pathToMethod(path, '_delete')
+		# If batching isn't enabled
+		if not self._batchPaths:
+			return Effect(error=(Errors.SERVICE_NO_SUCH_NOUN, 'POST _batch'))
 
-		# Try to find the method
-		try:
-			f = getattr(self, sMethod)
+		# If we didn't get a list of ops
+		if not isinstance(data, dict) or not isinstance(data.get('ops'), list):
+			return Effect(error=(Errors.REST_REQUEST_DATA, 'ops'))
 
-		# Method doesn't exist, URI is invalid
-		except AttributeError as e:
+		# Run the reads and return the dict of each Effect
+		return Effect([o.toDict() for o in self.readBatch(data['ops'], sesh)])
 
-			# If the method wasn't found
-			if "'%s'" % sMethod in e.args[0]:
-				return Effect(error=(Errors.SERVICE_NO_SUCH_NOUN, 'DELETE %s' % path))
-			else:
-				raise
+	def create(self, path, data, sesh=None):
+		"""Create
 
-		# Try to call the method
-		try:
-			if sesh: return f(data, sesh)
-			else: return f(data)
+		Create a new object
 
-			# Effect thrown
-		except EffectException as e:
-			return e.args[0]
+		Arguments:
+			path (str): The path passed to the request
+			data (mixed): The data sent with the request
+			sesh (Sesh._Session): The session passed to the request
+
+		Return:
+			Effect
+		"""
+		return self.__dispatch(path, data, sesh, '_create', 'POST')
+
+	def delete(self, path, data, sesh=None):
+		"""Delete
+
+		Delete an existing object
+
+		Arguments:
+			path (str): The path passed to the request
+			data (mixed): The data sent with the request
+			sesh (Sesh._Session): The session passed to the request
+
+		Return:
+			Effect
+		"""
+		return self.__dispatch(path, data, sesh, '_delete', 'DELETE')
 
 	def initialise(self):
 		"""Initialise
@@ -649,31 +1201,58 @@ class Service(object):
 		Return:
 			Effect
 		"""
+		return self.__dispatch(path, data, sesh, '_read', 'GET')
 
-		# Generate the method name from the URI
-		sMethod = self.pathToMethod(path, '_read')
+	def readBatch(self, ops, sesh=None):
+		"""Read Batch
 
-		# Try to find the method
-		try:
-			f = getattr(self, sMethod)
+		Runs several reads in order. Each path must be in _batchPaths, and is
+		only given the session if it requires one, the same as its own route
+		would. A bad op or a read that raises only fails that op
 
-		# Method doesn't exist, URI is invalid
-		except AttributeError as e:
+		Arguments:
+			ops (list): A list of (path, data) pairs to read
+			sesh (Sesh._Session): The session passed to the request
+
+		Return:
+			Effect[]
+		"""
 
-			# If the method wasn't found
-			if "'%s'" % sMethod in e.args[0]:
-				return Effect(error=(Errors.SERVICE_NO_SUCH_NOUN, 'GET %s' % path))
+		# Init the results
+		lRet = []
+
+		# Go through each op
+		for i, mOp in enumerate(ops):
+
+			# If the op isn't a path and data
+			if not isinstance(mOp, (list, tuple)) or len(mOp) != 2 or not isinstance(mOp[0], str):
+				lRet.append(Effect(error=(Errors.REST_REQUEST_DATA, 'ops.%d' % i)))
+				continue
+
+			# If the path can't be batched
+			sPath, mData = mOp
+			if sPath not in self._batchPaths:
+				lRet.append(Effect(error=(Errors.SERVICE_NO_SUCH_NOUN, 'GET %s' % sPath)))
+				continue
+
+			# If the path requires a session, make sure we have one, else
+			#	don't pass it
+			if self._batchPaths[sPath]:
+				if not sesh:
+					lRet.append(Effect(error=Errors.REST_AUTHORIZATION))
+					continue
+				oSesh = sesh
 			else:
-				raise
+				oSesh = None
 
-		# Try to call the method
-		try:
-			if sesh: return f(data, sesh)
-			else: return f(data)
+			# Run the read, catching any error so it only fails this op
+			try:
+				lRet.append(self.read(sPath, mData, oSesh))
+			except Exception as e:
+				lRet.append(Effect(error=(Errors.SERVICE_BATCH_OP, '%s: %s' % (sPath, str(e)))))
 
-			# Effect thrown
-		except EffectException as e:
-			return e.args[0]
+		# Return the results
+		return lRet
 
 	def update(self, path, data, sesh=None):
 		"""Update
@@ -688,37 +1267,15 @@ class Service(object):
 		Return:
 			Effect
 		"""
-
-		# Generate the method name from the URI
-		sMethod = self.pathToMethod(path, '_update')
-
-		# Try to find the method
-		try:
-			f = getattr(self, sMethod)
-
-		# Method doesn't exist, URI is invalid
-		except AttributeError as e:
-
-			# If the method wasn't found
-			if "'%s'" % sMethod in e.args[0]:
-				return Effect(error=(Errors.SERVICE_NO_SUCH_NOUN, 'PUT %s' % path))
-			else:
-				raise
-
-		# Try to call the method
-		try:
-			if sesh: return f(data, sesh)
-			else: return f(data)
-
-			# Effect thrown
-		except EffectException as e:
-			return e.args[0]
+		return self.__dispatch(path, data, sesh, '_update', 'PUT')
 
 	@staticmethod
+	@lru_cache(maxsize=1024)
 	def pathToMethod(path, append=''):
 		"""Path to Method
 
-		Takes a path and converts it to the standard naming for Service methods
+		Takes a path and converts it to the standard naming for Service methods.
+		Results are cached as services receive the same few paths repeatedly
 
 		Arguments:
 			path (str): The path to parse
@@ -727,14 +1284,21 @@ class Service(object):
 		Returns:
 			str
 		"""
-		sRet = ''
-		iLen = len(path)
-		i = 0
-		while i < iLen:
-			if(path[i] in ['/', '_']):
-				i += 1
-				sRet += path[i].upper()
-			else:
-				sRet += path[i]
-			i += 1
-		return sRet + append
+
+		# If the compiled version is available, use it
+		if _fastPathToMethod:
+			return _fastPathToMethod(path, append)
+
+		# If there are no adjacent separators, split on them and upper case the
+		#	first character of each part after the first, the string methods
+		#	do the per character work in C
+		if '//' not in path and '__' not in path and \
+			'/_' not in path and '_/' not in path:
+			lParts = path.replace('_', '/').split('/')
+			return lParts[0] + ''.join([
+				sPart[:1].upper() + sPart[1:] for sPart in lParts[1:]
+			]) + append
+
+		# Else, replace each slash or underscore and the character after it
+		#	with that character in upper case, even if it is itself a separator
+		return _SEPARATOR.sub(lambda m: m.group(1).upper(), path) + append
@@ -0,0 +1,45 @@
+# coding=utf8
+# cython: language_level=3
+""" Services Fast Module
+
+Compiled versions of hot Services helpers, used when available
+"""
+
+__author__ = "Chris Nasr"
+__copyright__ = "FUEL for the FIRE"
+__version__ = "1.0.0"
+__created__ = "2026-10-15"
+
+cpdef str pathToMethod(str path, str append=''):
+	"""Path to Method
+
+	Takes a path and converts it to the standard naming for Service methods
+
+	Arguments:
+		path (str): The path to parse
+		append (str): If set, appended to method name
+
+	Returns:
+		str
+	"""
+	cdef list lRet = []
+	cdef Py_ssize_t i = 0
+	cdef Py_ssize_t iLen = len(path)
+	cdef Py_UCS4 c
+
+	# Go through each character, replacing each separator and the character
+	#	after it with that character in upper case, even if it is itself a
+	#	separator
+	while i < iLen:
+		c = path[i]
+		if c == u'/' or c == u'_':
+			i += 1
+			if i < iLen:
+				c = path[i]
+				lRet.append(c.upper())
+		else:
+			lRet.append(c)
+		i += 1
+
+	# Join the characters and add the append
+	return ''.join(lRet) + append
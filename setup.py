@@ -1,4 +1,4 @@
-from setuptools import setup
+from setuptools import Extension, setup
 
 setup(
 	name='rest-oc',
@@ -11,11 +11,14 @@ setup(
 	license='Apache-2.0',
 	packages=['RestOC'],
 	install_requires=[
+		'aiohttp==3.8.3',
 		'bottle==0.12.13',
 		'format-oc==1.5.11',
 		'gunicorn==19.9.0',
 		'hiredis==0.2.0',
+		'httpx[http2]==0.23.3',
 		'Jinja2==2.10.1',
+		'orjson==3.8.3',
 		'pdfkit==0.6.1',
 		'Pillow==6.2.0',
 		'PyMySQL==0.9.3',
@@ -23,5 +26,9 @@ setup(
 		'requests==2.20.1',
 		'rethinkdb==2.4.1'
 	],
-	zip_safe=True
+	ext_modules=[
+		# Optional speedups, skipped if Cython or a compiler is missing
+		Extension('RestOC.Services_fast', ['RestOC/Services_fast.pyx'], optional=True)
+	],
+	zip_safe=False
 )